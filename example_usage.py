@@ -8,8 +8,29 @@ Includes new features: DIRECT_ANSWER, framework registry, and tool classificatio
 """
 
 from autonomous_agent import AutonomousAgent
+import asyncio
+import operator
+import os
+import sys
 import time
 
+# Seconds to pause between demos so output can be read (DEMO_PACE=2); off by default
+PACE = float(os.environ.get("DEMO_PACE", "0"))
+
+# Marker shown next to each skill in the memory demo
+STATUS_EMOJI = {"working": "✅", "untested": "🔶", "failed": "❌"}
+
+
+def _pace():
+    """Pause between demo steps if DEMO_PACE is set."""
+    if PACE > 0:
+        time.sleep(PACE)
+
+
+def _emit(lines):
+    """Write a block of demo output lines in one call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
 def demo_direct_answer():
     """Demo: DIRECT_ANSWER capability - LLM can respond without tools."""
@@ -36,128 +57,120 @@ The agent will decide when to use DIRECT_ANSWER vs tool-based flow.
         print(f"Expected behavior: {reasoning}")
     
     print("\n✓ DIRECT_ANSWER allows the LLM to bypass tools for simple queries")
-    time.sleep(1)
+    _pace()
 
 
 def demo_framework_registry():
     """Demo: Framework registry and tool assembly."""
-    print("\n" + "="*70)
-    print("DEMO: Framework Registry & Tool Assembly")
-    print("="*70)
-    
-    from frameworks import FrameworkRegistry, register_default_frameworks
+    from frameworks import default_registry
     
-    registry = FrameworkRegistry()
-    register_default_frameworks(registry)
+    registry = default_registry()
     
-    print(f"\nRegistered frameworks: {registry.list_frameworks()}")
+    lines = ["\n" + "="*70, "DEMO: Framework Registry & Tool Assembly", "="*70]
+    lines.append(f"\nRegistered frameworks: {registry.list_frameworks()}")
     
     # Show framework types
     think_frameworks = registry.find_by_type("think")
     do_frameworks = registry.find_by_type("do")
     
-    print(f"\nTHINK frameworks ({len(think_frameworks)}):")
-    for fw in think_frameworks:
-        print(f"  - {fw.name} ({fw.language})")
+    lines.append(f"\nTHINK frameworks ({len(think_frameworks)}):")
+    lines.extend(f"  - {fw.name} ({fw.language})" for fw in think_frameworks)
     
-    print(f"\nDO frameworks ({len(do_frameworks)}):")
-    for fw in do_frameworks:
-        print(f"  - {fw.name} ({fw.language})")
+    lines.append(f"\nDO frameworks ({len(do_frameworks)}):")
+    lines.extend(f"  - {fw.name} ({fw.language})" for fw in do_frameworks)
     
-    print("\n✓ Framework registry provides reusable code generation components")
-    time.sleep(2)
+    lines.append("\n✓ Framework registry provides reusable code generation components")
+    _emit(lines)
+    _pace()
 
 
-def demo_tool_classification():
+def demo_tool_classification(agent=None):
     """Demo: Tool classification (THINK vs DO)."""
-    print("\n" + "="*70)
-    print("DEMO: Tool Classification (THINK vs DO)")
-    print("="*70)
+    # Header first: constructing an agent prints its own status lines
+    _emit(["\n" + "="*70, "DEMO: Tool Classification (THINK vs DO)", "="*70])
     
-    agent = AutonomousAgent()
+    agent = agent or AutonomousAgent()
     
     think_tools = agent.get_tools_by_type("think")
     do_tools = agent.get_tools_by_type("do")
     
-    print(f"\nTHINK tools ({len(think_tools)}) - Planning & Analysis:")
-    for name, tool in think_tools.items():
-        print(f"  - {name}: {tool.description}")
+    lines = [f"\nTHINK tools ({len(think_tools)}) - Planning & Analysis:"]
+    lines.extend(f"  - {name}: {tool.description}" for name, tool in think_tools.items())
     
-    print(f"\nDO tools ({len(do_tools)}) - Execution & Action:")
-    for name, tool in do_tools.items():
-        print(f"  - {name}: {tool.description}")
+    lines.append(f"\nDO tools ({len(do_tools)}) - Execution & Action:")
+    lines.extend(f"  - {name}: {tool.description}" for name, tool in do_tools.items())
     
-    print("\n✓ Tool classification helps organize agent capabilities")
-    time.sleep(2)
+    lines.append("\n✓ Tool classification helps organize agent capabilities")
+    _emit(lines)
+    _pace()
 
 
-def demo_basic_skill(mode="llm-central"):
+def demo_basic_skill(mode="llm-central", agent=None):
     """Demo 1: Create a simple skill."""
     print("\n" + "="*70)
     print(f"DEMO 1: Basic Skill Creation ({mode} mode)")
     print("="*70)
     
-    agent = AutonomousAgent(mode=mode)
+    agent = agent or AutonomousAgent(mode=mode)
     agent.run(
         goal="Create a function that reverses a string",
         skill_name="string_reverser"
     )
     
-    time.sleep(2)
+    _pace()
 
 
-def demo_data_processing(mode="llm-central"):
+def demo_data_processing(mode="llm-central", agent=None):
     """Demo 2: Data processing skill."""
     print("\n" + "="*70)
     print(f"DEMO 2: Data Processing Skill ({mode} mode)")
     print("="*70)
     
-    agent = AutonomousAgent(mode=mode)
+    agent = agent or AutonomousAgent(mode=mode)
     agent.run(
         goal="Create a CSV parser that converts CSV text to a list of dictionaries",
         skill_name="csv_parser"
     )
     
-    time.sleep(2)
+    _pace()
 
 
-def demo_validation(mode="llm-central"):
+def demo_validation(mode="llm-central", agent=None):
     """Demo 3: Validation skill."""
     print("\n" + "="*70)
     print(f"DEMO 3: Validation Skill ({mode} mode)")
     print("="*70)
     
-    agent = AutonomousAgent(mode=mode)
+    agent = agent or AutonomousAgent(mode=mode)
     agent.run(
         goal="Create an email validator using regex",
         skill_name="email_validator"
     )
     
-    time.sleep(2)
+    _pace()
 
 
-def demo_memory_inspection():
+def demo_memory_inspection(agent=None):
     """Demo 4: Inspect agent memory."""
-    print("\n" + "="*70)
-    print("DEMO 4: Memory Inspection")
-    print("="*70)
+    # Header first: constructing an agent prints its own status lines
+    _emit(["\n" + "="*70, "DEMO 4: Memory Inspection", "="*70])
     
-    agent = AutonomousAgent()
+    agent = agent or AutonomousAgent()
     memory = agent.memory.read()
     
-    print(f"\nTotal skills learned: {len(memory['skills'])}")
-    print(f"Total failures logged: {len(memory['failures'])}")
-    print(f"Memory version: {memory['version']}")
+    lines = [f"\nTotal skills learned: {len(memory['skills'])}"]
+    lines.append(f"Total failures logged: {len(memory['failures'])}")
+    lines.append(f"Memory version: {memory['version']}")
     
-    print("\nSkills:")
-    for skill in memory['skills']:
-        status_emoji = {"working": "✅", "untested": "🔶", "failed": "❌"}
-        emoji = status_emoji.get(skill['status'], "❓")
-        print(f"  {emoji} {skill['name']}")
-        print(f"     {skill['description']}")
+    lines.append("\nSkills:")
+    fields = operator.itemgetter("status", "name", "description")
+    for status, name, description in map(fields, memory['skills']):
+        lines.append(f"  {STATUS_EMOJI.get(status, '❓')} {name}")
+        lines.append(f"     {description}")
+    _emit(lines)
 
 
-def demo_batch_processing(mode="llm-central"):
+def demo_batch_processing(mode="llm-central", agent=None):
     """Demo 5: Batch skill creation."""
     print("\n" + "="*70)
     print(f"DEMO 5: Batch Processing ({mode} mode)")
@@ -169,19 +182,18 @@ def demo_batch_processing(mode="llm-central"):
         ("Create a function to generate Fibonacci sequence", "fibonacci")
     ]
     
-    agent = AutonomousAgent(mode=mode)
+    agent = agent or AutonomousAgent(mode=mode)
     
-    for goal, name in goals:
-        print(f"\n→ Processing: {name}")
-        agent.run(goal=goal, skill_name=name)
-        time.sleep(1)
+    # Goals run concurrently; their LLM calls overlap on the Ollama server
+    print(f"\n→ Processing: {', '.join(name for _, name in goals)}")
+    asyncio.run(agent.run_many([g for g, _ in goals], [n for _, n in goals]))
     
     # Show results
     memory = agent.memory.read()
     print(f"\n✅ Batch complete! Created {len(memory['skills'])} skills")
 
 
-def demo_mode_comparison():
+def demo_mode_comparison(agent_llm=None):
     """Demo 6: Compare LLM-central vs graph mode."""
     print("\n" + "="*70)
     print("DEMO 6: Mode Comparison")
@@ -189,23 +201,31 @@ def demo_mode_comparison():
     
     goal = "Create a function to check if a string is a palindrome"
     
-    print("\n--- Testing LLM-CENTRAL MODE ---")
-    agent_llm = AutonomousAgent(mode="llm-central")
-    agent_llm.run(goal=goal, skill_name="palindrome_llm")
-    
-    time.sleep(2)
-    
-    print("\n--- Testing GRAPH MODE ---")
+    print("\n--- Testing LLM-CENTRAL and GRAPH MODE side by side ---")
+    agent_llm = agent_llm or AutonomousAgent(mode="llm-central")
     agent_graph = AutonomousAgent(mode="graph")
-    agent_graph.run(goal=goal, skill_name="palindrome_graph")
     
-    print("\n✅ Both modes completed. Check agent_workspace/skills/ to compare results.")
+    # Independent runs, so their LLM calls can overlap
+    async def compare():
+        return await asyncio.gather(
+            agent_llm.arun(goal=goal, skill_name="palindrome_llm"),
+            agent_graph.arun(goal=goal, skill_name="palindrome_graph"),
+        )
+    
+    # Both modes report whether the skill actually passed, not just whether
+    # the run finished without raising
+    llm_result, graph_result = asyncio.run(compare())
+    mark = {True: "✅", False: "❌"}
+    print(f"\nLLM-central: {mark[llm_result]}  |  Graph: {mark[graph_result]}")
+    
+    if llm_result and graph_result:
+        print("\n✅ Both modes succeeded. Check agent_workspace/skills/ to compare results.")
+    else:
+        print("\n⚠️  Not every mode produced a working skill. See the output above.")
 
 
 def main():
     """Run all demos."""
-    import sys
-    
     print("""
 ╔═══════════════════════════════════════════════════════════════╗
 ║   AUTONOMOUS AGENT - EXAMPLE USAGE                            ║
@@ -228,32 +248,38 @@ Each demo will run automatically. Press Ctrl+C to skip.
     input("Press Enter to start demos...")
     
     try:
+        # One agent for every LLM-central demo, warmed before the first run
+        agent = AutonomousAgent(mode="llm-central")
+        agent.warm_up()
+        
         # New feature demos
         demo_direct_answer()
         demo_framework_registry()
-        demo_tool_classification()
+        demo_tool_classification(agent)
         
         # Original demos in LLM-central mode (default)
-        demo_basic_skill(mode="llm-central")
-        demo_data_processing(mode="llm-central")
-        demo_validation(mode="llm-central")
-        demo_memory_inspection()
-        demo_batch_processing(mode="llm-central")
+        demo_basic_skill(agent=agent)
+        demo_data_processing(agent=agent)
+        demo_validation(agent=agent)
+        demo_memory_inspection(agent)
+        demo_batch_processing(agent=agent)
         
         # Mode comparison demo
-        demo_mode_comparison()
+        demo_mode_comparison(agent)
         
-        print("\n" + "="*70)
-        print("✅ ALL DEMOS COMPLETE")
-        print("="*70)
-        print("\nNew features demonstrated:")
-        print("  ✓ DIRECT_ANSWER - LLM can respond without tools")
-        print("  ✓ Framework Registry - Reusable code components")
-        print("  ✓ Tool Classification - THINK vs DO tools")
-        print("  ✓ LangGraph Planner - Dynamic workflow execution")
-        print("\nCheck agent_workspace/skills/ to see generated code!")
-        print("Run 'python3 autonomous_agent.py' for interactive mode.")
-        print("Use 'python3 autonomous_agent.py --graph' for legacy graph mode.")
+        _emit([
+            "\n" + "="*70,
+            "✅ ALL DEMOS COMPLETE",
+            "="*70,
+            "\nNew features demonstrated:",
+            "  ✓ DIRECT_ANSWER - LLM can respond without tools",
+            "  ✓ Framework Registry - Reusable code components",
+            "  ✓ Tool Classification - THINK vs DO tools",
+            "  ✓ LangGraph Planner - Dynamic workflow execution",
+            "\nCheck agent_workspace/skills/ to see generated code!",
+            "Run 'python3 autonomous_agent.py' for interactive mode.",
+            "Use 'python3 autonomous_agent.py --graph' for legacy graph mode.",
+        ])
         
     except KeyboardInterrupt:
         print("\n\nDemos interrupted. Exiting...")
@@ -7,11 +7,24 @@ and an assembler that can compose frameworks into deliverables.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Literal
+from functools import cache, lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Literal
 import re
 
 
-@dataclass
+# A {placeholder} in a framework template; braces without a matching
+# parameter (e.g. dict literals) are left untouched
+PLACEHOLDER_REGEX = re.compile(r"\{([^{}\n]+)\}")
+
+
+@lru_cache(maxsize=256)
+def _split_template(template: str) -> tuple:
+    """Split a template once into literal text (even indices) and
+    placeholder names (odd indices)."""
+    return tuple(PLACEHOLDER_REGEX.split(template))
+
+
+@dataclass(slots=True)
 class Framework:
     """Represents a reusable framework or component for code generation."""
     
@@ -30,20 +43,30 @@ class Framework:
         Returns:
             Rendered framework text with parameters substituted
         """
-        result = []
+        return "\n".join(self.iter_rendered(params))
+    
+    def iter_rendered(self, params: Dict[str, str]) -> Iterator[str]:
+        """
+        Yield the rendered framework as lines to be joined with newlines.
+        
+        Lets callers assembling several frameworks join everything once.
+        
+        Args:
+            params: Dictionary of parameters to substitute in templates
+        """
+        values = {key: str(value) for key, value in params.items()}
         
         for component_name, template in self.components.items():
-            # Substitute parameters in template
-            rendered = template
-            for key, value in params.items():
-                placeholder = f"{{{key}}}"
-                rendered = rendered.replace(placeholder, str(value))
+            # Substitute all parameters in one pass; substituted values are
+            # never rescanned for further placeholders
+            parts = list(_split_template(template))
+            for i in range(1, len(parts), 2):
+                name = parts[i]
+                parts[i] = values.get(name, f"{{{name}}}")
             
-            result.append(f"# Component: {component_name}")
-            result.append(rendered)
-            result.append("")
-        
-        return "\n".join(result)
+            yield f"# Component: {component_name}"
+            yield "".join(parts)
+            yield ""
 
 
 class FrameworkRegistry:
@@ -51,6 +74,9 @@ class FrameworkRegistry:
     
     def __init__(self):
         self._frameworks: Dict[str, Framework] = {}
+        # Secondary indexes: type / lower-cased language -> name -> framework
+        self._by_type: Dict[str, Dict[str, Framework]] = {}
+        self._by_language: Dict[str, Dict[str, Framework]] = {}
     
     def register(self, framework: Framework) -> None:
         """
@@ -59,7 +85,25 @@ class FrameworkRegistry:
         Args:
             framework: Framework to register
         """
+        previous = self._frameworks.get(framework.name)
+        if previous is not None:
+            # Replacing a framework may move it to another type or language
+            self._by_type[previous.type_].pop(previous.name, None)
+            self._by_language[previous.language.lower()].pop(previous.name, None)
+        
         self._frameworks[framework.name] = framework
+        self._by_type.setdefault(framework.type_, {})[framework.name] = framework
+        self._by_language.setdefault(framework.language.lower(), {})[framework.name] = framework
+    
+    def register_many(self, frameworks: Iterable[Framework]) -> None:
+        """
+        Register several frameworks in order, as register() would.
+        
+        Args:
+            frameworks: Frameworks to register
+        """
+        for framework in frameworks:
+            self.register(framework)
     
     def get(self, name: str) -> Optional[Framework]:
         """
@@ -92,7 +136,7 @@ class FrameworkRegistry:
         Returns:
             List of frameworks matching the type
         """
-        return [fw for fw in self._frameworks.values() if fw.type_ == type_]
+        return list(self._by_type.get(type_, {}).values())
     
     def find_by_language(self, language: str) -> List[Framework]:
         """
@@ -104,7 +148,7 @@ class FrameworkRegistry:
         Returns:
             List of frameworks for the language
         """
-        return [fw for fw in self._frameworks.values() if fw.language.lower() == language.lower()]
+        return list(self._by_language.get(language.lower(), {}).values())
 
 
 class ToolAssembler:
@@ -153,11 +197,10 @@ class ToolAssembler:
                     "message": f"Assembly failed: framework '{fw_name}' not found"
                 }
             
-            rendered = framework.render(params)
             rendered_parts.append(f"# Framework: {fw_name} (type: {framework.type_}, language: {framework.language})")
-            rendered_parts.append(rendered)
+            rendered_parts.extend(framework.iter_rendered(params))
         
-        # Concatenate all parts
+        # Concatenate all parts in one join
         assembled_code = "\n".join(rendered_parts)
         
         # Safety check if enforcer is available
@@ -268,6 +311,20 @@ if __name__ == '__main__':
     )
     
     # Register all default frameworks
-    registry.register(python_generator)
-    registry.register(analysis_prompt)
-    registry.register(test_harness)
+    registry.register_many([python_generator, analysis_prompt, test_harness])
+
+
+@cache
+def default_registry() -> FrameworkRegistry:
+    """
+    Shared registry holding the default frameworks.
+    
+    Built on first use and reused afterwards, so agents and demos share
+    one set of warm indexes instead of rebuilding them.
+    
+    Returns:
+        FrameworkRegistry populated by register_default_frameworks
+    """
+    registry = FrameworkRegistry()
+    register_default_frameworks(registry)
+    return registry
@@ -7,6 +7,9 @@ import re
 import json
 from typing import Dict
 
+# First flat JSON object in the analyzer model's reply
+JSON_OBJECT_REGEX = re.compile(r"\{[^}]+\}")
+
 
 class TaskAnalyzer:
     ANALYZER_MODEL = "qwen2.5:0.5b"
@@ -42,7 +45,7 @@ JSON only:"""
 
             content = response["message"]["content"]
 
-            json_match = re.search(r"\{[^}]+\}", content)
+            json_match = JSON_OBJECT_REGEX.search(content)
             if json_match:
                 return json.loads(json_match.group())
         except Exception:
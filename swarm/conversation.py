@@ -7,6 +7,11 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional: faster history (de)serialization
+    orjson = None
+
 
 class ConversationManager:
     """Manages conversation history for chat mode."""
@@ -24,7 +29,8 @@ class ConversationManager:
         """Load history from file."""
         if self.history_file.exists():
             try:
-                self._history = json.loads(self.history_file.read_text())
+                raw = self.history_file.read_bytes()
+                self._history = orjson.loads(raw) if orjson else json.loads(raw)
             except (json.JSONDecodeError, KeyError):
                 self._history = []
         else:
@@ -33,9 +39,11 @@ class ConversationManager:
     def _save(self):
         """Save history to file."""
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
-        self.history_file.write_text(
-            json.dumps(self._history[-self.max_history :], indent=2)
-        )
+        recent = self._history[-self.max_history :]
+        if orjson:
+            self.history_file.write_bytes(orjson.dumps(recent, option=orjson.OPT_INDENT_2))
+        else:
+            self.history_file.write_text(json.dumps(recent, indent=2))
 
     def add(self, role: str, content: str):
         """Add a message to history."""
@@ -5,6 +5,7 @@ Swarm Orchestrator - Main coordinator for multi-model collaboration
 import ollama
 from typing import Dict, Optional, List
 from pathlib import Path
+import re
 import subprocess
 import tempfile
 import os
@@ -12,6 +13,9 @@ import os
 from .intent import classify_intent
 from .conversation import ConversationManager
 
+# Body of the first markdown fence, skipping its language tag (python, py, ...)
+CODE_FENCE_REGEX = re.compile(r"```[^\n]*\n(.*?)(?:```|\Z)", re.DOTALL)
+
 
 class SwarmOrchestrator:
     MAX_ITERATIONS = 12
@@ -284,12 +288,9 @@ Code:"""
 
         code = response["message"]["content"]
 
-        if "```" in code:
-            parts = code.split("```")
-            if len(parts) > 1:
-                code = parts[1]
-                if code.startswith("python"):
-                    code = code[6:]
+        match = CODE_FENCE_REGEX.search(code)
+        if match:
+            code = match.group(1)
 
         return {
             "success": True,
@@ -4,65 +4,117 @@ Pre-deployment validation script.
 Checks all requirements before running the agent.
 """
 
+import functools
+import os
+import platform
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version as package_version
 from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
 
 
-def check_system():
-    """Check system requirements."""
-    print("="*70)
-    print("SYSTEM REQUIREMENTS CHECK")
-    print("="*70)
+class Check(NamedTuple):
+    """One line of a check section's report."""
+    name: str
+    value: str
+    ok: bool
+
+
+def banner(title: str, first: bool = False) -> List[str]:
+    """Opening lines of a check section's report."""
+    lines = ["="*70, title, "="*70]
+    return lines if first else [""] + lines
+
+
+def report(checks: Iterable[Check]) -> Tuple[bool, List[str]]:
+    """Format checks as report lines; also return whether all passed."""
+    all_ok = True
+    lines = []
+    for check in checks:
+        status = "✅" if check.ok else "❌"
+        lines.append(f"{status} {check.name:20s}: {check.value}")
+        all_ok = all_ok and check.ok
+    return all_ok, lines
+
+
+_ollama_lock = threading.Lock()
+
+
+def ollama_state():
+    """
+    Probe Ollama once per run, for both the system and model checks.
+    
+    The CLI version comes from `ollama --version`; installed models come from
+    the server's HTTP API through the ollama client instead of `ollama list`.
     
-    checks = []
+    Returns:
+        Tuple of (CLI version, installed model names, error). version is
+        None if the CLI is missing; models is None and error says why if the
+        server can't be queried.
+    """
+    # Checks run concurrently; make the second caller wait for the first probe
+    with _ollama_lock:
+        return _probe_ollama()
+
+
+@functools.cache
+def _probe_ollama():
+    try:
+        result = subprocess.run(
+            ["ollama", "--version"],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=False
+        )
+        version = result.stdout.strip() if result.returncode == 0 else None
+    except (OSError, subprocess.TimeoutExpired):
+        version = None
     
+    try:
+        import ollama
+        models = [model.model for model in ollama.list().models]
+        return version, models, ""
+    except ImportError:
+        return version, None, "ollama Python package not installed"
+    except Exception as e:
+        return version, None, str(e)
+
+
+def check_system():
+    """Check system requirements."""
+    passed, lines = report(_system_checks())
+    return passed, "\n".join(banner("SYSTEM REQUIREMENTS CHECK", first=True) + lines)
+
+
+def _system_checks() -> Iterator[Check]:
     # Python version
     version_info = sys.version_info
     version = f"{version_info.major}.{version_info.minor}.{version_info.micro}"
     python_ok = version_info.major == 3 and version_info.minor >= 11
-    checks.append(("Python 3.11+", version, python_ok))
+    yield Check("Python 3.11+", version, python_ok)
     
-    # Ubuntu version (best effort)
+    # Ubuntu version (best effort); platform parses and caches os-release
     try:
-        with open("/etc/os-release") as f:
-            os_info = f.read()
-            ubuntu_ok = "24.04" in os_info or "Ubuntu" in os_info
-            os_version = "Ubuntu 24.04" if ubuntu_ok else "Unknown"
-    except:
+        os_release = platform.freedesktop_os_release()
+        ubuntu_ok = os_release.get("ID") == "ubuntu"
+        os_version = os_release.get("PRETTY_NAME", "Unknown")
+    except OSError:
         ubuntu_ok = False
         os_version = "Cannot detect"
-    checks.append(("Ubuntu 24.04", os_version, ubuntu_ok))
+    yield Check("Ubuntu 24.04", os_version, ubuntu_ok)
     
     # Ollama installation
-    try:
-        result = subprocess.run(
-            ["ollama", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        ollama_ok = result.returncode == 0
-        ollama_version = result.stdout.strip() if ollama_ok else "Not installed"
-    except:
-        ollama_ok = False
-        ollama_version = "Not found"
-    checks.append(("Ollama", ollama_version, ollama_ok))
-    
-    # Print results
-    for name, value, ok in checks:
-        status = "✅" if ok else "❌"
-        print(f"{status} {name:20s}: {value}")
-    
-    return all(ok for _, _, ok in checks)
+    ollama_version, _, _ = ollama_state()
+    yield Check("Ollama", ollama_version or "Not installed", ollama_version is not None)
 
 
 def check_dependencies():
     """Check Python dependencies."""
-    print("\n" + "="*70)
-    print("PYTHON DEPENDENCIES CHECK")
-    print("="*70)
-    
     required = {
         "langgraph": "0.3.0",
         "langchain-ollama": "0.2.0",
@@ -70,73 +122,49 @@ def check_dependencies():
         "pydantic": "2.5.0",
     }
     
-    checks = []
+    passed, lines = report(_dependency_checks(required))
+    return passed, "\n".join(banner("PYTHON DEPENDENCIES CHECK") + lines)
+
+
+def _dependency_checks(required: dict) -> Iterator[Check]:
+    # Read installed metadata in-process rather than spawning `pip show` per package
     for package, min_version in required.items():
         try:
-            result = subprocess.run(
-                ["pip", "show", package],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.split("\n"):
-                    if line.startswith("Version:"):
-                        installed = line.split(":")[1].strip()
-                        ok = True
-                        checks.append((package, installed, ok))
-                        break
-            else:
-                checks.append((package, "Not installed", False))
-        except:
-            checks.append((package, "Error checking", False))
-    
-    for name, version, ok in checks:
-        status = "✅" if ok else "❌"
-        print(f"{status} {name:20s}: {version}")
-    
-    return all(ok for _, _, ok in checks)
+            yield Check(package, package_version(package), True)
+        except PackageNotFoundError:
+            yield Check(package, "Not installed", False)
+        except Exception:
+            yield Check(package, "Error checking", False)
 
 
 def check_ollama_model():
     """Check if required model is available."""
-    print("\n" + "="*70)
-    print("OLLAMA MODEL CHECK")
-    print("="*70)
+    lines = banner("OLLAMA MODEL CHECK")
     
     required_model = "qwen3-coder"  # Alternative: "glm-4.7-flash"
+    # The server reports untagged models as "<name>:latest"
+    wanted = {required_model, f"{required_model}:latest"}
     
-    try:
-        result = subprocess.run(
-            ["ollama", "list"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode == 0:
-            if required_model in result.stdout:
-                print(f"✅ {required_model}: Available")
-                return True
-            else:
-                print(f"❌ {required_model}: Not found")
-                print(f"\nRun: ollama pull {required_model}")
-                return False
-        else:
-            print(f"❌ Ollama service not running")
-            print("\nRun: sudo systemctl start ollama")
-            return False
-    except:
-        print(f"❌ Cannot connect to Ollama")
-        return False
+    _, models, error = ollama_state()
+    
+    if models is None:
+        lines.append(f"❌ Cannot connect to Ollama: {error}")
+        lines.append("\nRun: sudo systemctl start ollama")
+        return False, "\n".join(lines)
+    if wanted.intersection(models):
+        lines.append(f"✅ {required_model}: Available")
+        return True, "\n".join(lines)
+    lines.append(f"❌ {required_model}: Not found")
+    lines.append(f"\nRun: ollama pull {required_model}")
+    return False, "\n".join(lines)
 
 
+# The workspace and permissions checks are one directory listing each and are
+# not cached between runs: fingerprinting their targets would cost the same
+# stats as re-checking them.
 def check_workspace():
     """Check workspace structure."""
-    print("\n" + "="*70)
-    print("WORKSPACE CHECK")
-    print("="*70)
+    lines = banner("WORKSPACE CHECK")
     
     workspace = Path("./agent_workspace")
     
@@ -146,28 +174,32 @@ def check_workspace():
         (workspace / "exec", "Execution directory"),
     ]
     
+    # One directory listing instead of a stat per subdirectory
+    try:
+        present = {entry.name for entry in os.scandir(workspace) if entry.is_dir()}
+    except FileNotFoundError:
+        present = None
+    
     all_ok = True
     for path, description in checks:
-        exists = path.exists()
+        exists = present is not None if path == workspace else path.name in (present or ())
         status = "✅" if exists else "❌"
-        print(f"{status} {description:20s}: {path}")
+        lines.append(f"{status} {description:20s}: {path}")
         
         if not exists:
             try:
                 path.mkdir(parents=True, exist_ok=True)
-                print(f"   └─ Created")
+                lines.append(f"   └─ Created")
             except Exception as e:
-                print(f"   └─ Error: {e}")
+                lines.append(f"   └─ Error: {e}")
                 all_ok = False
     
-    return all_ok
+    return all_ok, "\n".join(lines)
 
 
 def check_permissions():
     """Check file permissions."""
-    print("\n" + "="*70)
-    print("PERMISSIONS CHECK")
-    print("="*70)
+    lines = banner("PERMISSIONS CHECK")
     
     files = [
         "autonomous_agent.py",
@@ -176,18 +208,28 @@ def check_permissions():
         "example_usage.py",
     ]
     
+    entries = {entry.name: entry for entry in os.scandir(".")}
+    
     all_ok = True
     for filename in files:
-        path = Path(filename)
-        if path.exists():
-            is_executable = path.stat().st_mode & 0o111
+        entry = entries.get(filename)
+        if entry is not None:
+            is_executable = entry.stat().st_mode & 0o111
             status = "✅" if is_executable else "⚠️"
-            print(f"{status} {filename:25s}: {'Executable' if is_executable else 'Not executable'}")
+            lines.append(f"{status} {filename:25s}: {'Executable' if is_executable else 'Not executable'}")
         else:
-            print(f"❌ {filename:25s}: Not found")
+            lines.append(f"❌ {filename:25s}: Not found")
             all_ok = False
     
-    return all_ok
+    return all_ok, "\n".join(lines)
+
+
+def run_check(name, check_func):
+    """Run one check; returns (passed, report text)."""
+    try:
+        return check_func()
+    except Exception as e:
+        return False, f"\n❌ {name} check failed: {e}"
 
 
 def main():
@@ -206,13 +248,14 @@ def main():
         ("File Permissions", check_permissions),
     ]
     
+    # Checks are independent and mostly wait on subprocesses, so run them
+    # together; each returns its report, printed whole in the order listed
     results = {}
-    for name, check_func in checks:
-        try:
-            results[name] = check_func()
-        except Exception as e:
-            print(f"\n❌ {name} check failed: {e}")
-            results[name] = False
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        futures = [pool.submit(run_check, name, fn) for name, fn in checks]
+        for (name, _), future in zip(checks, futures):
+            results[name], output = future.result()
+            print(output)
     
     # Summary
     print("\n" + "="*70)